@@ -1,33 +1,75 @@
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from PIL import Image
 
-def compress_and_resize_images(input_folder, output_folder, max_width=1024, quality=85):
+# Compressed size (bits per pixel) under which an image that needs no resizing
+# is considered already optimized and copied as-is
+SKIP_BITS_PER_PIXEL = 0.5
+
+def _process_one(input_path, output_path, max_width, quality, optimize, progressive, skip_if_smaller_than):
+    """Compress and resize a single image (runs in a worker process)."""
+    with Image.open(input_path) as img:
+        # Copy images that need no resizing and are already small, rather than
+        # paying for (and losing quality to) another lossy encode
+        if img.width <= max_width:
+            size_threshold = skip_if_smaller_than
+            if size_threshold is None:
+                size_threshold = img.width * img.height * SKIP_BITS_PER_PIXEL / 8
+            if os.path.getsize(input_path) < size_threshold:
+                # Nothing to copy when processing a folder in place
+                if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+                    print(f"Unchanged: {os.path.basename(input_path)}")
+                    return
+                shutil.copyfile(input_path, output_path)
+                print(f"Copied: {os.path.basename(input_path)} -> {output_path}")
+                return
+
+        # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while decoding;
+        # draft() is only a hint, so LANCZOS below handles the remaining scale
+        scale = img.width / max_width
+        if scale >= 2:
+            img.draft("RGB", (max_width, int(img.height / scale)))
+
+        # Resize image if it exceeds the maximum width
+        if img.width > max_width:
+            new_height = int((max_width / img.width) * img.height)
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+        # Save the compressed image with 4:2:0 chroma subsampling
+        img.save(output_path, format="JPEG", optimize=optimize, progressive=progressive, quality=quality, subsampling=2)
+        print(f"Processed: {os.path.basename(input_path)} -> {output_path}")
+
+def compress_and_resize_images(input_folder, output_folder, max_width=1024, quality=85, optimize=False, progressive=False,
+                               skip_if_smaller_than=None):
     """
     Compress and resize images in a folder for web display.
+
+    Images are processed in parallel, one worker process per CPU core.
     
     Parameters:
         input_folder (str): Path to the folder containing the images to process.
         output_folder (str): Path to the folder to save the processed images.
         max_width (int): Maximum width of the resized image (default: 1024 pixels).
         quality (int): Quality of the compressed image (default: 85, range 1-100).
+        optimize (bool): Make an extra encoder pass to compute optimal Huffman tables (default: False).
+        progressive (bool): Save as progressive JPEG (default: False). Progressive encoding always
+            optimizes the Huffman tables and writes several scans, so it is slower than a baseline encode.
+        skip_if_smaller_than (int): Copy images that need no resizing instead of re-encoding them when
+            the file is smaller than this many bytes (default: about 0.5 bits per pixel). Copied images
+            keep their EXIF data (including any GPS position) and ICC profile; re-encoded images lose both.
     """
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-    
-    for filename in os.listdir(input_folder):
-        if filename.lower().endswith(('.jpg', '.jpeg')):
-            input_path = os.path.join(input_folder, filename)
-            output_path = os.path.join(output_folder, filename)
+    os.makedirs(output_folder, exist_ok=True)
 
-            with Image.open(input_path) as img:
-                # Resize image if it exceeds the maximum width
-                if img.width > max_width:
-                    new_height = int((max_width / img.width) * img.height)
-                    img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+    with os.scandir(input_folder) as entries:
+        images = [entry for entry in entries if entry.is_file() and entry.name.lower().endswith(('.jpg', '.jpeg'))]
+    input_paths = [entry.path for entry in images]
+    output_paths = [os.path.join(output_folder, entry.name) for entry in images]
 
-                # Save the compressed image
-                img.save(output_path, format="JPEG", optimize=True, quality=quality)
-                print(f"Processed: {filename} -> {output_path}")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_process_one, input_paths, output_paths, repeat(max_width), repeat(quality),
+                          repeat(optimize), repeat(progressive), repeat(skip_if_smaller_than), chunksize=8))
 
 if __name__ == "__main__":
     import argparse
@@ -37,6 +79,10 @@ if __name__ == "__main__":
     parser.add_argument("-o", "--output_folder", type=str, required=True, help="Path to the folder to save the processed images.")
     parser.add_argument("--max_width", type=int, default=1024, help="Maximum width of the resized image (default: 1024 pixels).")
     parser.add_argument("--quality", type=int, default=85, help="Quality of the compressed image (default: 85).")
+    parser.add_argument("--optimize", action="store_true", help="Use an extra encoder pass for slightly smaller baseline JPEGs (slower; implied by --progressive).")
+    parser.add_argument("--progressive", action="store_true", help="Save progressive JPEGs (slower; also optimizes Huffman tables).")
+    parser.add_argument("--skip_if_smaller_than", type=int, default=None, help="Copy images that need no resizing when smaller than this many bytes (default: about 0.5 bits per pixel). Copies keep their EXIF/GPS data and ICC profile.")
     args = parser.parse_args()
 
-    compress_and_resize_images(args.input_folder, args.output_folder, args.max_width, args.quality)
\ No newline at end of file
+    compress_and_resize_images(args.input_folder, args.output_folder, args.max_width, args.quality, args.optimize, args.progressive,
+                               args.skip_if_smaller_than)
\ No newline at end of file
@@ -39,7 +39,7 @@ Outputs:
 
 Dependencies:
 - Python 3.x
-- Libraries: pandas, pytz, timezonefinder, dash, plotly, argparse
+- Libraries: pandas, pyarrow, numpy, pytz, timezonefinder, dash, plotly, argparse
 
 Author: Daniel J. Vreeman, PT, DPT, MS, FACMI, FIAHSI
 Date: [Creation or Last Modified Date]
@@ -50,27 +50,65 @@ Notes:
 - This script assumes a consistent schema in the input CSV file.
 """
 
+import numpy as np
 import pandas as pd
 import pytz
-from timezonefinder import TimezoneFinder
+from timezonefinder import TimezoneFinder, TimezoneFinderL
 import dash
 from dash import dcc, html
 import plotly.express as px
 import argparse
+import functools
+
+# Season names indexed by month number (index 0 is unused)
+_SEASON_LUT = np.array([
+    '',
+    'Hot Dry (Dec-Feb)', 'Hot Dry (Dec-Feb)',
+    'Long Rains (Mar-May)', 'Long Rains (Mar-May)', 'Long Rains (Mar-May)',
+    'Cool Dry (Jun-Aug)', 'Cool Dry (Jun-Aug)', 'Cool Dry (Jun-Aug)',
+    'Short Rains (Sep-Nov)', 'Short Rains (Sep-Nov)', 'Short Rains (Sep-Nov)',
+    'Hot Dry (Dec-Feb)'
+], dtype=object)
+
+# Seasons in calendar order, used as the categories of the season column
+_SEASON_ORDER = ['Hot Dry (Dec-Feb)', 'Long Rains (Mar-May)', 'Cool Dry (Jun-Aug)', 'Short Rains (Sep-Nov)']
+
+# Known column types of the sensor CSV, so pandas does not have to infer them.
+# The descriptive string columns hold one value per sensor, so they are loaded
+# as categoricals (small integer codes) rather than one string per row.
+_CSV_DTYPES = {
+    'liters': 'float32',
+    'temperature': 'float32',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'red_flag': 'Int8',
+    'community_name': 'category',
+    'service_provider': 'category',
+    'water_point_name': 'category',
+    'model': 'category',
+    'qr_code': 'category',
+    'installation_date': 'category'
+}
+
+# Lightweight grid-based timezone lookup, loaded once per process
+_TF = TimezoneFinderL()
+
+# Above this many rows the temperature scatter is reduced to per-bin averages
+SCATTER_MAX_POINTS = 20000
+TEMPERATURE_BINS = 50
 
 def load_data(csv_file):
     """Load and preprocess sensor data from CSV."""
-    df = pd.read_csv(csv_file)
+    df = pd.read_csv(csv_file, engine='pyarrow', dtype=_CSV_DTYPES, parse_dates=['gmt_datetime'])
 
-    # Convert datetime fields to UTC
-    df['gmt_datetime'] = pd.to_datetime(df['gmt_datetime'], utc=True)
+    # Make sure datetime fields are in UTC, whether or not the file carries an offset
+    df['gmt_datetime'] = pd.to_datetime(df['gmt_datetime'], utc=True).astype('datetime64[ns, UTC]')
 
     # Extract robust metadata
     metadata = extract_metadata(df)
 
     # Find the timezone using latitude and longitude
-    tf = TimezoneFinder()
-    timezone_str = tf.timezone_at(lat=metadata['latitude'], lng=metadata['longitude'])
+    timezone_str = find_timezone(metadata['latitude'], metadata['longitude'])
 
     if timezone_str is None:
         raise ValueError("Could not determine the timezone for the given location.")
@@ -79,16 +117,33 @@ def load_data(csv_file):
     local_tz = pytz.timezone(timezone_str)
     df['local_datetime'] = df['gmt_datetime'].dt.tz_convert(local_tz)
 
-    # Extract date, month, and hour in local time
-    df['date'] = df['local_datetime'].dt.date
-    df['month'] = df['local_datetime'].dt.month
-    df['hour'] = df['local_datetime'].dt.hour
+    # Extract date, month, and hour in local time. Dropping the timezone once
+    # gives naive wall-clock timestamps, so each field below is read directly
+    # instead of re-applying the UTC offset on every accessor call.
+    wall_clock = df['local_datetime'].dt.tz_localize(None)
+    df['date'] = wall_clock.dt.floor('D')
+    df['month'] = wall_clock.dt.month.astype('int8')
+    df['hour'] = wall_clock.dt.hour.astype('int8')
 
     # Assign seasons based on the month
-    df['season'] = df['month'].apply(determine_season)
+    df['season'] = pd.Categorical(_SEASON_LUT[df['month'].to_numpy()], categories=_SEASON_ORDER, ordered=True)
 
     return df, metadata, timezone_str
 
+@functools.lru_cache(maxsize=1)
+def _exact_timezone_finder():
+    """The exact (but much heavier) polygon-based finder, built only when first needed."""
+    return TimezoneFinder(in_memory=True)
+
+def find_timezone(lat, lng):
+    """Look up the timezone name for a location, or None if it cannot be determined."""
+    # The grid lookup is only trusted when its cell lies entirely within one timezone;
+    # near a border, fall back to the exact polygon lookup
+    timezone_str = _TF.unique_timezone_at(lat=lat, lng=lng)
+    if timezone_str is None:
+        timezone_str = _exact_timezone_finder().timezone_at(lat=lat, lng=lng)
+    return timezone_str
+
 def extract_metadata(df):
     """Extract robust metadata by scanning the dataset."""
     valid_lat_lon = df[['latitude', 'longitude']].dropna().iloc[0] if not df[['latitude', 'longitude']].dropna().empty else {'latitude': 0, 'longitude': 0}
@@ -96,34 +151,38 @@ def extract_metadata(df):
     metadata = {
         'latitude': valid_lat_lon['latitude'],
         'longitude': valid_lat_lon['longitude'],
-        'community_name': df['community_name'].mode().values[0] if not df['community_name'].mode().empty else 'Unknown',
-        'service_provider': df['service_provider'].mode().values[0] if not df['service_provider'].mode().empty else 'Unknown',
-        'water_point_name': df['water_point_name'].mode().values[0] if not df['water_point_name'].mode().empty else 'Unknown',
-        'installation_date': df['installation_date'].mode().values[0] if 'installation_date' in df and not df['installation_date'].mode().empty else 'Unknown',
-        'model': df['model'].mode().values[0] if not df['model'].mode().empty else 'Unknown',
-        'qr_code': df['qr_code'].mode().values[0] if not df['qr_code'].mode().empty else 'Unknown'
+        'community_name': most_common_value(df['community_name']),
+        'service_provider': most_common_value(df['service_provider']),
+        'water_point_name': most_common_value(df['water_point_name']),
+        'installation_date': most_common_value(df['installation_date']) if 'installation_date' in df else 'Unknown',
+        'model': most_common_value(df['model']),
+        'qr_code': most_common_value(df['qr_code'])
     }
 
     return metadata
 
-def determine_season(month):
-    """Assign a season based on the month."""
-    if month in [12, 1, 2]:
-        return 'Hot Dry (Dec-Feb)'
-    elif month in [3, 4, 5]:
-        return 'Long Rains (Mar-May)'
-    elif month in [6, 7, 8]:
-        return 'Cool Dry (Jun-Aug)'
-    else:
-        return 'Short Rains (Sep-Nov)'
+def most_common_value(series):
+    """Return the most frequent non-null value in a column, or 'Unknown' if there is none."""
+    # A single hash-count pass; unlike mode() this does not sort the values
+    counts = series.value_counts(sort=False)
+    counts = counts[counts > 0]  # categorical columns also report unused categories
+    return counts.idxmax() if not counts.empty else 'Unknown'
+
 def calculate_key_metrics(df):
     """Calculate key metrics for display."""
-    recent_day_data = df[df['date'] == df['date'].max()]
-    avg_liters_hour_recent_day = recent_day_data.groupby('hour')['liters'].mean().mean()
+    max_date = df['date'].max()
+    last_7_days = df[df['date'] >= (max_date - pd.Timedelta(days=7))]
 
-    last_7_days = df[df['date'] >= (df['date'].max() - pd.Timedelta(days=7))]
-    avg_liters_hour_7_days = last_7_days.groupby('hour')['liters'].mean().mean()
-    avg_liters_day_7_days = last_7_days.groupby('date')['liters'].sum().mean()
+    # Aggregate the last 7 days once per (date, hour); every metric below is
+    # derived from this small table instead of re-grouping the raw rows
+    date_hour = last_7_days.groupby(['date', 'hour'], sort=False, observed=True)['liters'].agg(['sum', 'count'])
+
+    recent_day = date_hour.xs(max_date, level='date')
+    avg_liters_hour_recent_day = (recent_day['sum'] / recent_day['count']).mean()
+
+    by_hour = date_hour.groupby(level='hour', sort=False, observed=True).sum()
+    avg_liters_hour_7_days = (by_hour['sum'] / by_hour['count']).mean()
+    avg_liters_day_7_days = date_hour['sum'].groupby(level='date', sort=False, observed=True).sum().mean()
 
     est_beneficiaries = round(avg_liters_day_7_days / 15)
 
@@ -136,18 +195,35 @@ def calculate_key_metrics(df):
 
 def calculate_seasonal_averages(df):
     """Calculate average daily volume per season, excluding incomplete seasons."""
-    season_data = df.groupby(['season', 'date'])['liters'].sum().reset_index()
-    days_per_season = season_data.groupby('season')['date'].nunique()
+    season_data = df.groupby(['season', 'date'], sort=False, observed=True)['liters'].sum().reset_index()
+    days_per_season = season_data.groupby('season', sort=False, observed=True)['date'].nunique()
     complete_seasons = days_per_season[days_per_season >= 85].index
     season_data = season_data[season_data['season'].isin(complete_seasons)]
-    avg_volume_per_season = season_data.groupby('season')['liters'].mean().reset_index()
+    # Sorting the (at most four) season keys keeps the bars in calendar order
+    avg_volume_per_season = season_data.groupby('season', observed=True)['liters'].mean().reset_index()
     avg_volume_per_season.rename(columns={'liters': 'avg_daily_volume'}, inplace=True)
     return avg_volume_per_season
 
+def usage_vs_temperature_points(df):
+    """Points for the usage-vs-temperature scatter, averaged per temperature bin on large datasets."""
+    if len(df) <= SCATTER_MAX_POINTS:
+        return df[['temperature', 'liters']]
+
+    bin_codes, bin_edges = pd.cut(df['temperature'], TEMPERATURE_BINS, labels=False, retbins=True)
+    avg_liters = df.groupby(bin_codes, sort=False)['liters'].mean()
+    codes = avg_liters.index.to_numpy(dtype=int)
+    return pd.DataFrame({
+        'temperature': (bin_edges[codes] + bin_edges[codes + 1]) / 2,
+        'liters': avg_liters.to_numpy()
+    })
+
 def create_dashboard(csv_file):
     df, metadata, timezone_str = load_data(csv_file)
     key_metrics = calculate_key_metrics(df)
     seasonal_averages = calculate_seasonal_averages(df)
+    temperature_points = usage_vs_temperature_points(df)
+    # Large datasets are plotted as per-bin averages, so label the axis accordingly
+    temperature_liters_label = 'Water Flow (Liters)' if len(df) <= SCATTER_MAX_POINTS else 'Avg Water Flow (Liters)'
 
     app = dash.Dash(__name__)
 
@@ -164,8 +240,14 @@ def create_dashboard(csv_file):
 
             dcc.Graph(
                 id='sensor-location',
+                # The sensor location is constant, so plot a single marker
                 figure=px.scatter_mapbox(
-                    df, lat='latitude', lon='longitude',
+                    pd.DataFrame([{
+                        'latitude': metadata['latitude'],
+                        'longitude': metadata['longitude'],
+                        'community_name': metadata['community_name']
+                    }]),
+                    lat='latitude', lon='longitude',
                     hover_name='community_name', zoom=10,
                     mapbox_style="open-street-map"
                 ).update_layout(
@@ -203,7 +285,8 @@ def create_dashboard(csv_file):
         dcc.Graph(
             id='daily-water-flow',
             figure=px.line(
-                df.groupby('date')['liters'].sum().reset_index(), 
+                # Dates stay sorted so the line is drawn chronologically
+                df.groupby('date', observed=True)['liters'].sum().reset_index(),
                 x='date', y='liters', title='Daily Water Flow'
             ).update_traces(line_color='rgb(229, 142, 45)').update_layout(xaxis_showgrid=False)
         ),
@@ -212,7 +295,7 @@ def create_dashboard(csv_file):
         dcc.Graph(
             id='hourly-usage-pattern',
             figure=px.bar(
-                df.groupby('hour')['liters'].mean().reset_index(),
+                df.groupby('hour', sort=False, observed=True)['liters'].mean().reset_index(),
                 x='hour', y='liters',
                 title=f'Average Hourly Water Usage (Local Time: {timezone_str})',
                 labels={'hour': 'Hour (Local Time)', 'liters': 'Water Flow (Liters)'}
@@ -223,9 +306,9 @@ def create_dashboard(csv_file):
         dcc.Graph(
             id='usage-vs-temperature',
             figure=px.scatter(
-                df, x='temperature', y='liters',
+                temperature_points, x='temperature', y='liters',
                 title='Water Usage vs Sensor Temperature',
-                labels={'temperature': 'Temperature (°C)', 'liters': 'Water Flow (Liters)'}
+                labels={'temperature': 'Temperature (°C)', 'liters': temperature_liters_label}
             ).update_traces(marker=dict(color='rgb(229, 142, 45)')).update_layout(xaxis_showgrid=False)
         ),
 
@@ -8,8 +8,9 @@ The data is fetched starting from a given datetime, paginated as needed, and sav
 Functionality:
 1. Loads API credentials (API key and client ID) from a JSON configuration file.
 2. Constructs the appropriate API request based on the QR code and start datetime.
-3. Iterates through paginated responses to collect all data.
-4. Saves the data to a CSV file in a specified directory.
+3. Iterates through paginated responses to collect all data, reusing one HTTP connection pool
+   and fetching the remaining pages concurrently when the API reports the total page count.
+4. Streams each page of data into a CSV file in a specified directory.
 
 Usage:
 Run the script from the command line with the following required arguments:
@@ -32,28 +33,40 @@ Outputs:
 
 Dependencies:
 - Python 3.x
-- Libraries: requests, pandas, argparse, os, json, datetime
+- Libraries: requests, pandas, orjson, argparse, os, datetime
 
 Author: Daniel J. Vreeman, PT, DPT, MS, FACMI, FIAHSI
 
 Notes:
 - Ensure the configuration file is present at the specified path and contains valid API credentials.
 - Make sure the output directory exists before running the script.
+- The CSV columns are taken from the first page of logs. If a later page carries new fields, the
+  rows written so far are rewritten with the wider header, leaving the new fields empty for them.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
-import json
+import orjson
 import os
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+
+# Number of pages fetched concurrently once the total page count is known
+MAX_WORKERS = 8
+
+# Rows read at a time when an existing CSV is rewritten with a wider header
+REWRITE_CHUNK_ROWS = 100_000
 
 def load_config(config_file):
     """Load configuration from a JSON file."""
     if not os.path.exists(config_file):
         raise FileNotFoundError(f"Configuration file '{config_file}' not found.")
-    with open(config_file, 'r') as file:
-        config = json.load(file)
+    with open(config_file, 'rb') as file:
+        config = orjson.loads(file.read())
     return config.get("api_key"), config.get("client_id")
 
 def construct_output_file(output_dir, qr_code, start_datetime):
@@ -64,6 +77,66 @@ def construct_output_file(output_dir, qr_code, start_datetime):
     filename = f"sensor-{qr_code}-hourly-logs.csv"
     return os.path.join(output_dir, filename)
 
+def create_session(headers):
+    """Create an HTTP session that keeps connections to the API open between pages."""
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_page(session, base_url, params, page):
+    """Fetch one page of hourly logs. Returns the decoded response, or None on error."""
+    response = session.get(base_url, params={**params, "page": page})
+    if response.status_code != 200:
+        print(f"Error: {response.status_code} - {response.text}")
+        return None
+    return orjson.loads(response.content)
+
+def iter_log_pages(session, base_url, params):
+    """Yield the hourly logs of each page in order, stopping at the first failed page."""
+    data = fetch_page(session, base_url, params, params["page"])
+    while data:
+        yield data.get("hourly_logs", [])
+
+        next_page = data.get("next_page_number")
+        if not next_page:
+            return
+
+        total_pages = data.get("total_pages")
+        if total_pages:
+            # The page count is known, so fetch the remaining pages concurrently.
+            # At most MAX_WORKERS pages are in flight: a new page is requested only
+            # as one is handed on, so a failing API is not flooded and finished
+            # pages do not pile up in memory while an earlier one is slow.
+            pages = iter(range(next_page, total_pages + 1))
+            executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            try:
+                pending = deque(executor.submit(fetch_page, session, base_url, params, page)
+                                for page in islice(pages, MAX_WORKERS))
+                while pending:
+                    page_data = pending.popleft().result()
+                    if not page_data:
+                        return
+                    for page in islice(pages, 1):
+                        pending.append(executor.submit(fetch_page, session, base_url, params, page))
+                    yield page_data.get("hourly_logs", [])
+            finally:
+                # Drop queued pages after a failure or when the caller stops early
+                executor.shutdown(cancel_futures=True)
+            return
+
+        data = fetch_page(session, base_url, params, next_page)
+
+def widen_csv(output_file, columns):
+    """Rewrite the CSV written so far with a wider header, leaving the added columns empty."""
+    tmp_file = f"{output_file}.tmp"
+    # Values are read back as text so they are written out unchanged
+    chunks = pd.read_csv(output_file, dtype=str, keep_default_na=False, chunksize=REWRITE_CHUNK_ROWS)
+    for i, chunk in enumerate(chunks):
+        chunk.reindex(columns=columns).to_csv(tmp_file, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    os.replace(tmp_file, output_file)
+
 def fetch_sensor_data(api_key, client_id, qr_code, start_datetime, output_file):
     base_url = "https://api-charitywater.org/v1/hourly-logs"
     headers = {
@@ -77,26 +150,29 @@ def fetch_sensor_data(api_key, client_id, qr_code, start_datetime, output_file):
         "page": 1
     }
 
-    all_logs = []
-
-    while True:
-        response = requests.get(base_url, headers=headers, params=params)
-        if response.status_code != 200:
-            print(f"Error: {response.status_code} - {response.text}")
-            break
-
-        data = response.json()
-        logs = data.get("hourly_logs", [])
-        all_logs.extend(logs)
-
-        next_page = data.get("next_page_number")
-        if not next_page:
-            break
-        params["page"] = next_page
-
-    if all_logs:
-        df = pd.DataFrame(all_logs)
-        df.to_csv(output_file, index=False)
+    # Each page is appended to the CSV as soon as it arrives. The first page
+    # fixes the columns for the file; in the rare case that a later page adds
+    # keys, the file is rewritten once with the wider header.
+    columns = None
+
+    with create_session(headers) as session:
+        for logs in iter_log_pages(session, base_url, params):
+            if not logs:
+                continue
+            if columns is not None:
+                new_keys = [key for key in dict.fromkeys(key for log in logs for key in log) if key not in columns]
+                if new_keys:
+                    print(f"Adding fields not present on earlier pages: {', '.join(new_keys)}")
+                    columns = columns + new_keys
+                    widen_csv(output_file, columns)
+            df = pd.DataFrame(logs, columns=columns)
+            if columns is None:
+                columns = list(df.columns)
+                df.to_csv(output_file, mode='w', header=True, index=False)
+            else:
+                df.to_csv(output_file, mode='a', header=False, index=False)
+
+    if columns is not None:
         print(f"Data saved to {output_file}")
     else:
         print("No data found.")
@@ -1,5 +1,5 @@
 import requests
-import json
+import orjson
 import re
 import argparse
 import os
@@ -31,18 +31,15 @@ def get_water_source_by_id(client_id, water_source_id, output_file, brief):
     try:
         response = requests.get(url, headers=headers)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data:
-                if not os.path.exists('output'):
-                    os.makedirs('output')
-
-                with open(output_file, 'w') as f:
+                with open(output_file, 'wb') as f:
 
                     if brief:
                         brief_data = [{'_id': wp['_id'], 'name': wp['name']} for wp in data]
-                        json.dump(brief_data, f, indent=4)
+                        f.write(orjson.dumps(brief_data, option=orjson.OPT_INDENT_2))
                     else:
-                        json.dump(data, f, indent=4)
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                         print(f"Data successfully written to '{output_file}'.")
 
     except requests.exceptions.RequestException as e:
@@ -63,30 +60,27 @@ def search_flexible_sites(client_id, search_string, output_file, brief):
 
     params = {
         'limit': 100,
-        'filter': json.dumps({
+        'filter': orjson.dumps({
             '$or': [
                 {'name': {'$regex': search_string, '$options': 'i'}},
                 {'desc': {'$regex': search_string, '$options': 'i'}}
             ]
-        })
+        }).decode()
     }
 
     try:
         response = requests.get(url, headers=headers, params=params)
         if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data:
-                    if not os.path.exists('output'):
-                        os.makedirs('output')
-
-                    with open(output_file, 'w') as f:
+                    with open(output_file, 'wb') as f:
                         # Handle brief output if specified
                             
                         if brief:
                             brief_data = [{'_id': wp['_id'], 'name': wp['name']} for wp in data]
-                            json.dump(brief_data, f, indent=4)
+                            f.write(orjson.dumps(brief_data, option=orjson.OPT_INDENT_2))
                         else:
-                            json.dump(data, f, indent=4)
+                            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                             print(f"Data successfully written to '{output_file}'.")
 
                 else:
@@ -117,11 +111,11 @@ def main():
     client_id = read_client_id(args.config)
 
     if client_id:
+        # Create the output folder once, up front
+        os.makedirs('output', exist_ok=True)
     
         # Step 2: Check if a water source ID is specified
         if args.water_source_id:
-            if not os.path.exists('output'):
-                os.makedirs('output')
             get_water_source_by_id(client_id, args.water_source_id, args.output_file, args.brief)
         elif args.search_string:
         
@@ -1,14 +1,22 @@
 import requests
+from requests.adapters import HTTPAdapter
+import orjson
 import os
 import argparse
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of photos downloaded concurrently
+MAX_WORKERS = 16
+
+# Size of the chunks used when streaming images to disk (64 KB)
+CHUNK_SIZE = 1 << 16
 
 # Function to read client_id from a file
 def read_client_id(file_path):
     try:
         with open(file_path, 'r') as file:
             client_id = file.read().strip()
-            print(f"Client ID read from file: {client_id}")
             return client_id
     except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -17,6 +25,27 @@ def read_client_id(file_path):
         print(f"An error occurred while reading the file: {e}")
         return None
 
+# Function to download a single photo and save it to disk
+def download_photo(session, idx, photo_url, photo_path):
+    # Stream the image to disk in chunks rather than buffering it in memory.
+    # Write to a temporary file and only move it into place once the whole
+    # body has arrived, so a dropped connection never leaves a truncated image.
+    with session.get(photo_url, stream=True) as photo_response:
+        if photo_response.status_code == 200:
+            tmp_path = f"{photo_path}.part"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in photo_response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                os.replace(tmp_path, photo_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            print(f"Downloaded image {idx} to {photo_path}")
+        else:
+            print(f"Failed to download image {idx}. Status Code: {photo_response.status_code}")
+
 # Function to fetch water point details by ID and download images
 def download_images(client_id, water_point_id, download_folder):
     # Properly encode the filter parameter
@@ -32,7 +61,7 @@ def download_images(client_id, water_point_id, download_folder):
         # Fetch water point details
         response = requests.get(url, headers=headers)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             #print(data)
 
             # Check if data is a non-empty list
@@ -49,23 +78,20 @@ def download_images(client_id, water_point_id, download_folder):
                         print(f"Found {len(photos)} photos for water point {water_point_id}.")
                         
                         # Create the download folder if it doesn't exist
-                        if not os.path.exists(download_folder):
-                            os.makedirs(download_folder)
+                        os.makedirs(download_folder, exist_ok=True)
 
-                        # Download each photo
-                        for idx, photo in enumerate(photos, start=1):
-                            photo_id = photo['id']
-                            photo_url = f'https://api.mwater.co/v3/images/{photo_id}'
-                            photo_path = os.path.join(download_folder, f"{water_point_id}-{idx}.jpg")
+                        tasks = [
+                            (idx,
+                             f"https://api.mwater.co/v3/images/{photo['id']}",
+                             os.path.join(download_folder, f"{water_point_id}-{idx}.jpg"))
+                            for idx, photo in enumerate(photos, start=1)
+                        ]
 
-                            # Download and save the image
-                            photo_response = requests.get(photo_url)
-                            if photo_response.status_code == 200:
-                                with open(photo_path, 'wb') as f:
-                                    f.write(photo_response.content)
-                                print(f"Downloaded image {idx} to {photo_path}")
-                            else:
-                                print(f"Failed to download image {idx}. Status Code: {photo_response.status_code}")
+                        # Download the photos concurrently over a shared connection pool
+                        with requests.Session() as session:
+                            session.mount('https://', HTTPAdapter(pool_maxsize=MAX_WORKERS))
+                            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                                list(executor.map(lambda task: download_photo(session, *task), tasks))
                     else:
                         print(f"No photos found for water point {water_point_id}.")
                 else:
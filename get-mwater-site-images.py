@@ -1,4 +1,5 @@
 import requests
+import orjson
 import os
 import argparse
 
@@ -7,7 +8,6 @@ def read_client_id(file_path):
     try:
         with open(file_path, 'r') as file:
             client_id = file.read().strip()
-            print(f"Client ID read from file: {client_id}")
             return client_id
     except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -29,13 +29,12 @@ def download_images(client_id, water_point_id, download_folder):
         # Fetch water point details
         response = requests.get(url, headers=headers)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if 'photos' in data:
                 photos = data['photos']
                 if photos:
                     print(f"Found {len(photos)} photos for water point {water_point_id}.")
-                    if not os.path.exists(download_folder):
-                        os.makedirs(download_folder)
+                    os.makedirs(download_folder, exist_ok=True)
 
                     # Download each photo
                     for idx, photo in enumerate(photos, start=1):
@@ -1,10 +1,11 @@
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import argparse
 import os
 
-def plot_daily_water_flow(csv_file):
-    """Load CSV data, calculate daily water flow, and plot it."""
+def plot_daily_water_flow(csv_file, interactive=False):
+    """Load CSV data, calculate daily water flow, and plot it (showing it too if interactive)."""
     # Load the CSV data
     try:
         df = pd.read_csv(csv_file)
@@ -31,7 +32,7 @@ def plot_daily_water_flow(csv_file):
     service_provider = df['service_provider'].iloc[0]
 
     # Plot the data without vertical grid lines
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=(10, 6))
     plt.plot(daily_flow['date'], daily_flow['liters'], marker='o', linestyle='-', markersize=5)
 
     # Add labels and title
@@ -54,8 +55,10 @@ def plot_daily_water_flow(csv_file):
     plt.savefig(output_image)
     print(f"Plot saved as '{output_image}'")
 
-    # Show the plot
-    plt.show()
+    # Show the plot only when asked to, then free the figure
+    if interactive:
+        plt.show()
+    plt.close(fig)
 
 def main():
     # Set up command-line argument parsing
@@ -63,15 +66,22 @@ def main():
     parser.add_argument(
         "-f", "--csv_file", required=True, help="Path to the CSV file containing sensor data"
     )
+    parser.add_argument(
+        "--interactive", action="store_true", help="Also show the plot in a window after saving it"
+    )
     args = parser.parse_args()
 
+    # Without a window to show, use the non-GUI Agg backend so no GUI toolkit is loaded
+    if not args.interactive:
+        matplotlib.use("Agg")
+
     # Validate the CSV file path
     if not os.path.isfile(args.csv_file):
         print(f"Error: The file '{args.csv_file}' does not exist.")
         exit(1)
 
     # Generate the plot
-    plot_daily_water_flow(args.csv_file)
+    plot_daily_water_flow(args.csv_file, args.interactive)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -39,7 +39,7 @@ Outputs:
 
 Dependencies:
 - Python 3.x
-- Libraries: pandas, pytz, timezonefinder, dash, plotly, argparse
+- Libraries: pandas, pyarrow, numpy, timezonefinder, dash, plotly, natsort, flask-caching, orjson, redis (optional, see Notes)
 
 Author: Daniel J. Vreeman, PT, DPT, MS, FACMI, FIAHSI
 Date: [Creation or Last Modified Date]
@@ -48,16 +48,31 @@ Notes:
 - Ensure the CSV file contains valid and complete data for the sensor.
 - The dashboard will automatically detect and adjust timestamps based on the sensor's location.
 - This script assumes a consistent schema in the input CSV file.
+- Run `python run_sensor_dashboard_for_web.py --precompute-rollups` nightly to write Parquet rollups
+  next to each sensor CSV; the dashboard reads those instead of re-parsing the CSV when they are current.
+  The same job writes a static HTML snapshot of each dashboard to /var/www/sensor-data/static/ for
+  read-only viewers. Serve it from the web server behind the same access control as the dashboard.
+- In production, set SENSOR_DASHBOARD_REDIS_URL so parsed data is cached in Redis and shared by all
+  worker processes; without it (e.g. when developing locally) an in-process cache is used.
 """
 
 import os
-import json
+import functools
+import hashlib
+import time
+from html import escape as escape_html
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 import pandas as pd
-import pytz
+import pyarrow as pa
+import pyarrow.compute as pc
 from timezonefinder import TimezoneFinder
 import dash
 from dash import dcc, html, Input, Output, State
+from flask_caching import Cache
 import plotly.express as px
+import plotly.io as pio
 import glob
 import logging
 from natsort import natsorted
@@ -68,6 +83,75 @@ DATA_DIR = "/var/www/sensor-data"
 # Define the path to the configuration file
 CONFIG_PATH = os.path.join(DATA_DIR ,"config", "dashboard-config.json")
 
+# Cache for parsed sensor data. Set SENSOR_DASHBOARD_REDIS_URL (e.g. redis://localhost:6379/0)
+# to share it between worker processes; without it each process keeps its own in-memory cache.
+REDIS_URL = os.environ.get("SENSOR_DASHBOARD_REDIS_URL")
+CACHE_CONFIG = {
+    'CACHE_TYPE': 'RedisCache' if REDIS_URL else 'SimpleCache',
+    'CACHE_DEFAULT_TIMEOUT': 24 * 60 * 60
+}
+if REDIS_URL:
+    CACHE_CONFIG['CACHE_REDIS_URL'] = REDIS_URL
+
+# Season names indexed by month number (index 0 is unused)
+_SEASON_LUT = np.array([
+    '',
+    'Hot Dry (Dec-Feb)', 'Hot Dry (Dec-Feb)',
+    'Long Rains (Mar-May)', 'Long Rains (Mar-May)', 'Long Rains (Mar-May)',
+    'Cool Dry (Jun-Aug)', 'Cool Dry (Jun-Aug)', 'Cool Dry (Jun-Aug)',
+    'Short Rains (Sep-Nov)', 'Short Rains (Sep-Nov)', 'Short Rains (Sep-Nov)',
+    'Hot Dry (Dec-Feb)'
+], dtype=object)
+
+# Seasons in calendar order, used as the categories of the season column
+_SEASON_ORDER = ['Hot Dry (Dec-Feb)', 'Long Rains (Mar-May)', 'Cool Dry (Jun-Aug)', 'Short Rains (Sep-Nov)']
+
+# Known column types of the sensor CSV, so pandas does not have to infer them.
+# Text columns are Arrow-backed strings rather than Python objects.
+_CSV_DTYPES = {
+    'qr_code': 'string[pyarrow]',
+    'water_point_name': 'string[pyarrow]',
+    'service_provider': 'string[pyarrow]',
+    'community_name': 'string[pyarrow]',
+    'model': 'string[pyarrow]',
+    'installation_date': 'string[pyarrow]',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'liters': 'float32',
+    'temperature': 'float32',
+    'red_flag': 'Int8'
+}
+
+# Rows parsed at a time when streaming a sensor CSV
+CSV_CHUNK_ROWS = 200_000
+
+# Sensor data files are named f"{SENSOR_FILE_PREFIX}<sensor_id>{SENSOR_FILE_SUFFIX}"
+SENSOR_FILE_PREFIX = "sensor-"
+SENSOR_FILE_SUFFIX = "-hourly-logs.csv"
+
+# Seconds the list of available sensors is reused before DATA_DIR is scanned again
+SENSOR_LIST_TTL = 30
+
+# Timezone lookup, loaded into memory once per process
+_TF = TimezoneFinder(in_memory=True)
+
+# Precomputed dashboard aggregates stored per sensor as Parquet files, plus
+# the scalar values stored in the sensor's rollup JSON file
+ROLLUP_TABLES = ('daily', 'hourly', 'seasonal', 'temperature')
+ROLLUP_SUMMARY_KEYS = ('metadata', 'timezone', 'key_metrics', 'last_reading', 'red_flag_count')
+
+# Pre-rendered, read-only dashboard pages written by the nightly job
+STATIC_DIR = os.path.join(DATA_DIR, "static")
+
+# Columns read from each CSV when only sensor metadata is needed
+METADATA_COLUMNS = {
+    'latitude', 'longitude', 'community_name', 'service_provider',
+    'water_point_name', 'installation_date', 'model', 'qr_code'
+}
+
+# Serialize figures (including Dash callback outputs) with orjson rather than the stdlib encoder
+pio.json.config.default_engine = 'orjson'
+
 # Configure logging
 logging.basicConfig(
     filename=os.path.join(DATA_DIR ,"log", "water_sensor_dashboard.log"),  # Path to your log file
@@ -80,54 +164,96 @@ logging.info("Sensor Dashboard server started.")
 
 ### MAIN SCRIPT HERE ###
 
+# Password hashes from the configuration file, re-read only when the file changes
+_PASSWORD_CACHE = {'mtime': None, 'hashes': frozenset()}
+
+def hash_password(password):
+    """Return the SHA-256 digest used to compare passwords without keeping them in plain text."""
+    return hashlib.sha256(password.encode("utf-8")).digest()
+
 def load_passwords(config_path):
-    """Load passwords from a JSON configuration file."""
+    """Load password hashes from a JSON configuration file, reusing them until the file changes."""
     try:
-        with open(config_path, "r") as file:
-            config = json.load(file)
-            return config.get("passwords", [])
+        mtime = os.stat(config_path).st_mtime
+        if mtime != _PASSWORD_CACHE['mtime']:
+            with open(config_path, "rb") as file:
+                config = orjson.loads(file.read())
+            _PASSWORD_CACHE['hashes'] = frozenset(hash_password(p) for p in config.get("passwords", []))
+            _PASSWORD_CACHE['mtime'] = mtime
+        return _PASSWORD_CACHE['hashes']
     except FileNotFoundError:
         print(f"Error: Configuration file '{config_path}' not found.")
-        return []
-    except json.JSONDecodeError:
+        return frozenset()
+    except orjson.JSONDecodeError:
         print(f"Error: Invalid JSON format in '{config_path}'.")
-        return []
+        return frozenset()
 
 def load_data(csv_file):
-    """Load and preprocess sensor data from CSV."""
-    df = pd.read_csv(csv_file)
-
-    # Convert datetime fields to UTC
-    df['gmt_datetime'] = pd.to_datetime(df['gmt_datetime'], utc=True)
-
-    # Extract robust metadata
-    metadata = extract_metadata(df)
-
-    # Find the timezone using latitude and longitude
-    tf = TimezoneFinder()
-    timezone_str = tf.timezone_at(lat=metadata['latitude'], lng=metadata['longitude'])
-
-    if timezone_str is None:
-        raise ValueError("Could not determine the timezone for the given location.")
-
-    # Convert timestamps to local timezone
-    local_tz = pytz.timezone(timezone_str)
-    df['local_datetime'] = df['gmt_datetime'].dt.tz_convert(local_tz)
-
-    # Debugging: Print a few rows for validation
-    logging.debug(f"Timezone: {timezone_str}")
-    logging.debug(df[['gmt_datetime', 'local_datetime']].head())  # Corrected line
+    """Stream sensor data from CSV in chunks and reduce it to the aggregates the dashboard needs.
+
+    Only one chunk of raw rows is in memory at a time. Returns the aggregates
+    (liters sums and counts per local date and hour, and per temperature step,
+    plus the red flag count and last reading), the metadata, and the timezone.
+    """
+    date_hour_parts = []
+    temperature_parts = []
+    last_readings = []
+    red_flag_count = 0
+    metadata = None
+    timezone_str = None
+
+    # The pyarrow engine cannot read in chunks, so the C parser is used here
+    for chunk in pd.read_csv(csv_file, dtype=_CSV_DTYPES, parse_dates=['gmt_datetime'], chunksize=CSV_CHUNK_ROWS):
+        # Convert datetime fields to UTC
+        chunk['gmt_datetime'] = pd.to_datetime(chunk['gmt_datetime'], utc=True)
+
+        if metadata is None:
+            # Extract robust metadata; the sensor details do not change between
+            # rows, so the first chunk is enough
+            metadata = extract_metadata(chunk)
+
+            # Find the timezone using latitude and longitude
+            timezone_str = find_timezone(metadata['latitude'], metadata['longitude'])
+
+            if timezone_str is None:
+                raise ValueError("Could not determine the timezone for the given location.")
+            logging.debug(f"Timezone: {timezone_str}")
+
+        # Extract date and hour in local time with Arrow compute kernels:
+        # one cast to local wall-clock time, then vectorized field extraction
+        utc_timestamps = pa.array(chunk['gmt_datetime'])
+        wall_clock = pc.local_timestamp(utc_timestamps.cast(pa.timestamp('ns', tz=timezone_str)))
+        chunk['date'] = wall_clock.cast(pa.date32()).to_numpy(zero_copy_only=False)
+        chunk['hour'] = pc.hour(wall_clock).cast(pa.int8()).to_numpy(zero_copy_only=False)
+
+        # Partial aggregates for this chunk, combined once all chunks are read
+        date_hour_parts.append(chunk.groupby(['date', 'hour'], sort=False, observed=True)['liters'].agg(['sum', 'count']))
+        temperature_parts.append(sum_usage_by_temperature(chunk))
+        red_flag_count += int((chunk['red_flag'] == 1).sum())
+        last_readings.append(chunk['gmt_datetime'].max())
+
+    if metadata is None:
+        raise ValueError(f"No sensor data found in '{csv_file}'.")
+
+    aggregates = {
+        'date_hour': pd.concat(date_hour_parts).groupby(level=['date', 'hour'], sort=False, observed=True).sum(),
+        'temperature': pd.concat(temperature_parts).groupby(level='temperature', sort=False, observed=True).sum(),
+        'red_flag_count': red_flag_count,
+        'last_reading': pd.Series(last_readings).max().tz_convert(timezone_str)
+    }
     logging.debug("Conversion to local time completed.")
 
-    # Extract date, month, and hour in local time
-    df['date'] = df['local_datetime'].dt.date
-    df['month'] = df['local_datetime'].dt.month
-    df['hour'] = df['local_datetime'].dt.hour
+    return aggregates, metadata, timezone_str
 
-    # Assign seasons based on the month
-    df['season'] = df['month'].apply(determine_season)
+@functools.lru_cache(maxsize=1024)
+def _cached_timezone_at(lat, lng):
+    return _TF.timezone_at(lat=lat, lng=lng)
 
-    return df, metadata, timezone_str
+def find_timezone(lat, lng):
+    """Look up the timezone name for a location, or None if it cannot be determined."""
+    # Rounding to 3 decimals (~111 m) is far finer than timezone boundaries
+    # and lets repeated lookups for the same sensor hit the cache
+    return _cached_timezone_at(round(float(lat), 3), round(float(lng), 3))
 
 def load_images(sensor_id):
     """Load images from the data directory for the given sensor_id."""
@@ -145,7 +271,7 @@ def create_carousel_images(sensor_id):
         html.Div(
             html.Img(
                 src=f"/images/{sensor_id}/{os.path.basename(image)}",  # Use relative URL
-                style={'width': '100%', 'height': 'auto'}
+                className="carousel-image"
             ),
             style={'display': 'block' if idx == 0 else 'none'}  # Only the first image is visible
         )
@@ -167,39 +293,35 @@ def extract_metadata(df):
     metadata = {
         'latitude': valid_lat_lon['latitude'],
         'longitude': valid_lat_lon['longitude'],
-        'community_name': df['community_name'].mode().values[0] if not df['community_name'].mode().empty else 'Unknown',
-        'service_provider': df['service_provider'].mode().values[0] if not df['service_provider'].mode().empty else 'Unknown',
-        'water_point_name': format_water_point_name(
-            df['water_point_name'].mode().values[0]
-            if not df['water_point_name'].mode().empty
-            else 'Unknown'
-        ),
-        'installation_date': df['installation_date'].mode().values[0] if 'installation_date' in df and not df['installation_date'].mode().empty else 'Unknown',
-        'model': df['model'].mode().values[0] if not df['model'].mode().empty else 'Unknown',
-        'qr_code': df['qr_code'].mode().values[0] if not df['qr_code'].mode().empty else 'Unknown'
+        'community_name': most_common_value(df['community_name']),
+        'service_provider': most_common_value(df['service_provider']),
+        'water_point_name': format_water_point_name(most_common_value(df['water_point_name'])),
+        'installation_date': most_common_value(df['installation_date']) if 'installation_date' in df else 'Unknown',
+        'model': most_common_value(df['model']),
+        'qr_code': most_common_value(df['qr_code'])
     }
 
     return metadata
 
-def determine_season(month):
-    """Assign a season based on the month."""
-    if month in [12, 1, 2]:
-        return 'Hot Dry (Dec-Feb)'
-    elif month in [3, 4, 5]:
-        return 'Long Rains (Mar-May)'
-    elif month in [6, 7, 8]:
-        return 'Cool Dry (Jun-Aug)'
-    else:
-        return 'Short Rains (Sep-Nov)'
+def most_common_value(series):
+    """Return the most frequent non-null value in a column, or 'Unknown' if there is none."""
+    # A single hash-count pass; unlike mode() this does not sort the values
+    counts = series.value_counts(sort=False)
+    counts = counts[counts > 0]  # categorical columns also report unused categories
+    return counts.idxmax() if not counts.empty else 'Unknown'
 
-def calculate_key_metrics(df):
-    """Calculate key metrics for display."""
-    recent_day_data = df[df['date'] == df['date'].max()]
-    avg_liters_hour_recent_day = recent_day_data.groupby('hour')['liters'].mean().mean()
+def calculate_key_metrics(date_hour):
+    """Calculate key metrics for display from the liters sums and counts per (date, hour)."""
+    dates = date_hour.index.get_level_values('date')
+    max_date = dates.max()
+    last_7_days = date_hour[dates >= (max_date - pd.Timedelta(days=7))]
 
-    last_7_days = df[df['date'] >= (df['date'].max() - pd.Timedelta(days=7))]
-    avg_liters_hour_7_days = last_7_days.groupby('hour')['liters'].mean().mean()
-    avg_liters_day_7_days = last_7_days.groupby('date')['liters'].sum().mean()
+    recent_day = last_7_days.xs(max_date, level='date')
+    avg_liters_hour_recent_day = (recent_day['sum'] / recent_day['count']).mean()
+
+    by_hour = last_7_days.groupby(level='hour', sort=False, observed=True).sum()
+    avg_liters_hour_7_days = (by_hour['sum'] / by_hour['count']).mean()
+    avg_liters_day_7_days = last_7_days['sum'].groupby(level='date', sort=False, observed=True).sum().mean()
 
     est_beneficiaries = round(avg_liters_day_7_days / 15)
 
@@ -210,28 +332,209 @@ def calculate_key_metrics(df):
         "Estimated Beneficiaries": est_beneficiaries
     }
 
-def calculate_seasonal_averages(df):
-    """Calculate average daily volume per season, excluding incomplete seasons."""
-    season_data = df.groupby(['season', 'date'])['liters'].sum().reset_index()
-    days_per_season = season_data.groupby('season')['date'].nunique()
+def calculate_seasonal_averages(daily):
+    """Calculate average daily volume per season from daily totals, excluding incomplete seasons."""
+    season = pd.Categorical(_SEASON_LUT[daily['date'].dt.month.to_numpy()], categories=_SEASON_ORDER, ordered=True)
+    season_data = daily.assign(season=season)
+
+    # Only built-in reducers are used below, so every groupby stays on pandas'
+    # compiled aggregation path. Each date appears once, so the group size is
+    # the number of days.
+    days_per_season = season_data.groupby('season', sort=False, observed=True).size()
     complete_seasons = days_per_season[days_per_season >= 85].index
     season_data = season_data[season_data['season'].isin(complete_seasons)]
     
     # Calculate average daily volume per season
-    avg_volume_per_season = season_data.groupby('season')['liters'].mean().reset_index()
+    avg_volume_per_season = season_data.groupby('season', sort=False, observed=True, as_index=False)['liters'].mean()
     avg_volume_per_season.rename(columns={'liters': 'avg_daily_volume'}, inplace=True)
     
-    # Define custom order for seasons
-    season_order = ['Hot Dry (Dec-Feb)', 'Long Rains (Mar-May)', 'Cool Dry (Jun-Aug)', 'Short Rains (Sep-Nov)']
-    avg_volume_per_season['season'] = pd.Categorical(avg_volume_per_season['season'], categories=season_order, ordered=True)
-    
-    # Sort by the custom order
+    # Sort by the custom order (season is an ordered categorical)
     avg_volume_per_season.sort_values('season', inplace=True)
     
     return avg_volume_per_season
 
-def create_dashboard_layout(df, metadata, timezone_str, key_metrics, seasonal_averages, sensor_id):
-    """Create the layout for the sensor dashboard."""
+def sum_usage_by_temperature(df):
+    """Liters sums and counts per 0.1 °C of sensor temperature, for the usage-vs-temperature scatter."""
+    # One point per temperature step instead of one per reading keeps the plot
+    # small no matter how long the sensor has been logging. Rounding happens in
+    # float64, since a float32 32.6 would otherwise be stored as 32.599998.
+    rounded = df.assign(temperature=df['temperature'].astype('float64').round(1))
+    return rounded.groupby('temperature', sort=False, observed=True)['liters'].agg(['sum', 'count'])
+
+def mean_liters(sums):
+    """Turn a table of liters sums and counts into a frame of mean liters per index value."""
+    return (sums['sum'] / sums['count']).rename('liters').reset_index()
+
+def build_dashboard_data(csv_file):
+    """Load a sensor CSV and reduce it to the values and aggregates shown on its dashboard."""
+    aggregates, metadata, timezone_str = load_data(csv_file)
+    date_hour = aggregates['date_hour']
+    # Daily totals stay sorted so the daily flow line is drawn chronologically
+    daily = date_hour['sum'].groupby(level='date', observed=True).sum().rename('liters').reset_index()
+
+    return {
+        'metadata': metadata,
+        'timezone': timezone_str,
+        'key_metrics': calculate_key_metrics(date_hour),
+        'last_reading': str(aggregates['last_reading']),
+        'red_flag_count': aggregates['red_flag_count'],
+        'daily': daily,
+        'hourly': mean_liters(date_hour.groupby(level='hour', sort=False, observed=True).sum()),
+        'seasonal': calculate_seasonal_averages(daily),
+        'temperature': mean_liters(aggregates['temperature'])
+    }
+
+def rollup_path(sensor_id, name, extension="parquet"):
+    """Path of one of a sensor's precomputed rollup files."""
+    return os.path.join(DATA_DIR, f"sensor-{sensor_id}-{name}.{extension}")
+
+def _to_json_value(value):
+    """Convert numpy scalars (and anything else orjson can't handle) for orjson.dumps."""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def precompute_sensor_rollups(sensor_id):
+    """Write a sensor's dashboard aggregates next to its CSV (meant to run as a nightly job)."""
+    csv_file = os.path.join(DATA_DIR, f"sensor-{sensor_id}-hourly-logs.csv")
+    data = build_dashboard_data(csv_file)
+    for name in ROLLUP_TABLES:
+        data[name].to_parquet(rollup_path(sensor_id, name), index=False)
+
+    # The JSON file is written last, so its presence means the rollup is complete
+    summary = {key: data[key] for key in ROLLUP_SUMMARY_KEYS}
+    with open(rollup_path(sensor_id, "metadata", "json"), "wb") as file:
+        file.write(orjson.dumps(summary, default=_to_json_value))
+    logging.info(f"Rollups written for sensor {sensor_id}.")
+
+def load_sensor_rollups(sensor_id, csv_file):
+    """Read a sensor's precomputed aggregates, or return None if they are missing or older than the CSV."""
+    summary_path = rollup_path(sensor_id, "metadata", "json")
+    try:
+        if os.path.getmtime(summary_path) < os.path.getmtime(csv_file):
+            return None
+        with open(summary_path, "rb") as file:
+            data = orjson.loads(file.read())
+        for name in ROLLUP_TABLES:
+            data[name] = pd.read_parquet(rollup_path(sensor_id, name))
+    except (OSError, ValueError) as e:
+        logging.debug(f"No usable rollups for sensor {sensor_id}: {e}")
+        return None
+    return data
+
+def render_static_snapshot(sensor_id):
+    """Write a read-only HTML page of a sensor's dashboard to STATIC_DIR (meant to run after the rollups)."""
+    csv_file = os.path.join(DATA_DIR, f"sensor-{sensor_id}-hourly-logs.csv")
+    data = load_sensor_rollups(sensor_id, csv_file) or build_dashboard_data(csv_file)
+    metadata = data['metadata']
+
+    def info_table(items):
+        rows = "".join(
+            f"<tr><td>{escape_html(str(label))}</td><td>{escape_html(str(value))}</td></tr>"
+            for label, value in items
+        )
+        return f'<table class="info-table">{rows}</table>'
+
+    # Load plotly.js from the CDN once, with the first figure
+    plots = "\n".join(
+        figure.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+        for i, figure in enumerate(create_figures(data).values())
+    )
+    title = escape_html(str(metadata['water_point_name']))
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="/assets/style.css">
+</head>
+<body>
+<h1 class="main-title">{title}</h1>
+<div class="dashboard-row">
+<div class="dashboard-subsection"><h2>Sensor Information</h2>
+{info_table((key.replace('_', ' ').title(), value) for key, value in metadata.items())}</div>
+<div class="dashboard-subsection"><h2>Key Metrics</h2>
+{info_table(data['key_metrics'].items())}</div>
+</div>
+<div class="red-flag-box">
+<p class="last-reading">Last Reading: {escape_html(str(data['last_reading']))}</p>
+<h4 class="red-flag-count">Red Flag Events (Last 30 Days): {data['red_flag_count']}</h4>
+</div>
+{plots}
+</body>
+</html>
+"""
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    with open(os.path.join(STATIC_DIR, f"sensor-{sensor_id}.html"), "w", encoding="utf-8") as file:
+        file.write(page)
+    logging.info(f"Static snapshot written for sensor {sensor_id}.")
+
+def create_info_table(items):
+    """Render (label, value) pairs as a two-column table; styling lives in assets/style.css."""
+    return html.Table(
+        [html.Tr([html.Td(label), html.Td(str(value))]) for label, value in items],
+        className="info-table"
+    )
+
+def create_figures(data):
+    """Build the dashboard's Plotly figures from its precomputed values, keyed by graph id."""
+    metadata = data['metadata']
+    return {
+        # The sensor location is constant, so plot a single marker
+        'sensor-location': px.scatter_mapbox(
+            pd.DataFrame([{
+                'latitude': metadata['latitude'],
+                'longitude': metadata['longitude'],
+                'community_name': metadata['community_name']
+            }]),
+            lat='latitude', lon='longitude',
+            hover_name='community_name', zoom=10,
+            mapbox_style="open-street-map"
+        ).update_layout(
+            margin=dict(l=0, r=0, t=0, b=0),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        ),
+
+        # Daily Water Flow Plot
+        'daily-water-flow': px.line(
+            data['daily'],
+            x='date', y='liters', title='Daily Water Flow'
+        ).update_traces(line_color='rgb(229, 142, 45)').update_layout(xaxis_showgrid=False),
+
+        # Average Hourly Usage Plot
+        'hourly-usage-pattern': px.bar(
+            data['hourly'],
+            x='hour', y='liters',
+            title=f"Average Hourly Water Usage (Local Time: {data['timezone']})",
+            labels={'hour': 'Hour (Local Time)', 'liters': 'Water Flow (Liters)'}
+        ).update_traces(marker_color='rgb(229, 142, 45)'),
+
+        # Usage vs Temperature Scatter Plot
+        'usage-vs-temperature': px.scatter(
+            data['temperature'], x='temperature', y='liters',
+            title='Water Usage vs Sensor Temperature',
+            labels={'temperature': 'Temperature (°C)', 'liters': 'Avg Water Flow (Liters)'}
+        ).update_traces(marker=dict(color='rgb(229, 142, 45)')).update_layout(xaxis_showgrid=False),
+
+        # Seasonal Usage Plot
+        'seasonal-usage': px.bar(
+            data['seasonal'],
+            x='season',
+            y='avg_daily_volume',
+            title='Average Daily Water Usage per Season',
+            labels={'season': 'Season', 'avg_daily_volume': 'Avg Daily Volume (Liters)'}
+        ).update_traces(marker_color='rgb(229, 142, 45)')
+    }
+
+def create_dashboard_layout(data, figures, sensor_id):
+    """Create the layout for the sensor dashboard.
+
+    `data` holds the precomputed values (see build_dashboard_data) and `figures`
+    the figure dicts for each graph id (see create_figures).
+    """
+    metadata = data['metadata']
+    key_metrics = data['key_metrics']
+
     # Load carousel images
     image_files = load_images(sensor_id)
     image_elements = create_carousel_images(sensor_id)
@@ -245,30 +548,19 @@ def create_dashboard_layout(df, metadata, timezone_str, key_metrics, seasonal_av
             # Sensor Information
             html.Div([
                 html.H2("Sensor Information"),
-                *[html.P([html.B(f"{key.replace('_', ' ').title()}: "), str(value)]) for key, value in metadata.items()]
+                create_info_table((key.replace('_', ' ').title(), value) for key, value in metadata.items())
             ], className="dashboard-subsection"),
 
             # Location (Map Section) with fixed height
             html.Div([
                 html.H2("Location"),
-                dcc.Graph(
-                    id='sensor-location',
-                    figure=px.scatter_mapbox(
-                        df, lat='latitude', lon='longitude',
-                        hover_name='community_name', zoom=10,
-                        mapbox_style="open-street-map"
-                    ).update_layout(
-                        margin=dict(l=0, r=0, t=0, b=0),
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)'
-                    )
-                )
+                dcc.Graph(id='sensor-location', figure=figures['sensor-location'])
             ], className="dashboard-subsection fixed-height"),
 
             # Key Metrics
             html.Div([
                 html.H2("Key Metrics"),
-                *[html.P([html.B(label), f": {value}"]) for label, value in key_metrics.items()]
+                create_info_table(key_metrics.items())
             ], className="dashboard-subsection"),
 
             # Sensor Images
@@ -288,81 +580,81 @@ def create_dashboard_layout(df, metadata, timezone_str, key_metrics, seasonal_av
 
         # Red Flag Events Warning Box
         html.Div([
-            html.P(f"Last Reading: {df['local_datetime'].max()}", style={
-                'fontSize': '14px', 'margin': '0 0 10px 0', 'fontFamily': 'Arial, sans-serif'
-            }),
-            html.H4(f"Red Flag Events (Last 30 Days): {df[df['red_flag'] == 1].shape[0]}", style={
-                'color': 'red', 'margin': '0', 'fontFamily': 'Arial, sans-serif'
-            })
-        ], style={
-            'border': '1px solid red', 'border-radius': '10px', 'padding': '10px',
-            'backgroundColor': '#ffe6e6', 'marginBottom': '20px', 'textAlign': 'center'
-        }),
-
-        # Daily Water Flow Plot
-        dcc.Graph(
-            id='daily-water-flow',
-            figure=px.line(
-                df.groupby('date')['liters'].sum().reset_index(),
-                x='date', y='liters', title='Daily Water Flow'
-            ).update_traces(line_color='rgb(229, 142, 45)').update_layout(xaxis_showgrid=False)
-        ),
-
-        # Average Hourly Usage Plot
-        dcc.Graph(
-            id='hourly-usage-pattern',
-            figure=px.bar(
-                df.groupby('hour')['liters'].mean().reset_index(),
-                x='hour', y='liters',
-                title=f'Average Hourly Water Usage (Local Time: {timezone_str})',
-                labels={'hour': 'Hour (Local Time)', 'liters': 'Water Flow (Liters)'}
-            ).update_traces(marker_color='rgb(229, 142, 45)')
-        ),
-
-        # Usage vs Temperature Scatter Plot
-        dcc.Graph(
-            id='usage-vs-temperature',
-            figure=px.scatter(
-                df, x='temperature', y='liters',
-                title='Water Usage vs Sensor Temperature',
-                labels={'temperature': 'Temperature (°C)', 'liters': 'Water Flow (Liters)'}
-            ).update_traces(marker=dict(color='rgb(229, 142, 45)')).update_layout(xaxis_showgrid=False)
-        ),
-
-        # Seasonal Usage Plot
-        dcc.Graph(
-            id='seasonal-usage',
-            figure=px.bar(
-                seasonal_averages,
-                x='season',
-                y='avg_daily_volume',
-                title='Average Daily Water Usage per Season',
-                labels={'season': 'Season', 'avg_daily_volume': 'Avg Daily Volume (Liters)'}
-            ).update_traces(marker_color='rgb(229, 142, 45)')
-        )
+            html.P(f"Last Reading: {data['last_reading']}", className="last-reading"),
+            html.H4(f"Red Flag Events (Last 30 Days): {data['red_flag_count']}", className="red-flag-count")
+        ], className="red-flag-box"),
+
+        # Plots
+        dcc.Graph(id='daily-water-flow', figure=figures['daily-water-flow']),
+        dcc.Graph(id='hourly-usage-pattern', figure=figures['hourly-usage-pattern']),
+        dcc.Graph(id='usage-vs-temperature', figure=figures['usage-vs-temperature']),
+        dcc.Graph(id='seasonal-usage', figure=figures['seasonal-usage'])
     ])
 
 # Dash App Setup
 app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=['assets/style.css'])
 server = app.server  # Flask app exposed for WSGI
+cache = Cache(server, config=CACHE_CONFIG)
+
+@cache.memoize()
+def load_sensor_data(sensor_id, csv_file, mtime):
+    """Load the dashboard values for a sensor, preferring its precomputed rollups.
+
+    Results are cached; `mtime` is the CSV's modification time, so updating
+    the CSV automatically invalidates the cached entry.
+    """
+    data = load_sensor_rollups(sensor_id, csv_file)
+    if data is None:
+        data = build_dashboard_data(csv_file)
+    return data
+
+@cache.memoize()
+def load_figures_json(sensor_id, csv_file, mtime):
+    """Build a sensor's figures and serialize them to JSON once.
+
+    Plotly's figure serialization is the slowest part of rendering a dashboard,
+    so the JSON strings are cached (keyed on the CSV's modification time) and
+    later requests only decode them.
+    """
+    data = load_sensor_data(sensor_id, csv_file, mtime)
+    return {graph_id: figure.to_json() for graph_id, figure in create_figures(data).items()}
+
+@functools.lru_cache(maxsize=1)
+def _scan_sensor_ids(time_bucket):
+    """Scan DATA_DIR for sensor CSVs; `time_bucket` only serves to expire the cached result."""
+    with os.scandir(DATA_DIR) as entries:
+        return tuple(
+            entry.name[len(SENSOR_FILE_PREFIX):-len(SENSOR_FILE_SUFFIX)]
+            for entry in entries
+            if entry.is_file() and entry.name.startswith(SENSOR_FILE_PREFIX) and entry.name.endswith(SENSOR_FILE_SUFFIX)
+        )
 
 def get_available_sensors():
-    """List available sensor IDs based on file names."""
-    files = [f for f in os.listdir(DATA_DIR) if f.startswith("sensor-") and f.endswith("-hourly-logs.csv")]
-    return [f.split('-')[1] for f in files]
+    """List available sensor IDs based on file names (rescanned at most every SENSOR_LIST_TTL seconds)."""
+    return list(_scan_sensor_ids(int(time.monotonic() // SENSOR_LIST_TTL)))
+
+def load_sensor_metadata(sensor_id):
+    """Read the metadata of one sensor from the start of its CSV, or None if the file is missing."""
+    file_path = os.path.join(DATA_DIR, f"sensor-{sensor_id}-hourly-logs.csv")
+    if not os.path.exists(file_path):
+        return None
+    # Read a limited number of rows, and only the metadata columns
+    # (the pyarrow engine does not support nrows, so the C parser is used here)
+    df = pd.read_csv(file_path, nrows=2000, usecols=lambda column: column in METADATA_COLUMNS, dtype=_CSV_DTYPES)
+    metadata = extract_metadata(df)
+    metadata['sensor_id'] = sensor_id  # Add sensor ID to metadata
+    return metadata
 
+@cache.memoize(timeout=300)
 def get_sensor_metadata():
     """Retrieve metadata for all available sensors."""
     sensor_ids = get_available_sensors()
-    metadata_list = []
-    for sensor_id in sensor_ids:
-        file_path = os.path.join(DATA_DIR, f"sensor-{sensor_id}-hourly-logs.csv")
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path, nrows=2000)  # Read a limited number of rows for metadata
-            metadata = extract_metadata(df)
-            metadata['sensor_id'] = sensor_id  # Add sensor ID to metadata
-            metadata_list.append(metadata)
-    return metadata_list
+    if not sensor_ids:
+        return []
+    # The sensor files are read concurrently; results keep the sensor order
+    with ThreadPoolExecutor(max_workers=min(32, len(sensor_ids))) as executor:
+        metadata_list = list(executor.map(load_sensor_metadata, sensor_ids))
+    return [metadata for metadata in metadata_list if metadata is not None]
 
 # Login layout
 def login_layout():
@@ -474,10 +766,10 @@ app.layout = html.Div([
 )
 def authenticate_user(n_clicks, n_submit, password, auth_state):
     """Authenticate user based on password input."""
-    # Load passwords from the configuration file
+    # Load password hashes from the configuration file (cached until it changes)
     passwords = load_passwords(CONFIG_PATH)
 
-    if (n_clicks or n_submit) and password in passwords:  # Check against list of passwords
+    if (n_clicks or n_submit) and password is not None and hash_password(password) in passwords:
         auth_state["authenticated"] = True
         return auth_state, ""
     elif n_clicks or n_submit:
@@ -497,10 +789,13 @@ def render_page(auth_state, pathname):
         sensor_id = pathname.split("/")[-1]
         csv_file = os.path.join(DATA_DIR, f"sensor-{sensor_id}-hourly-logs.csv")
         if os.path.exists(csv_file):
-            df, metadata, timezone_str = load_data(csv_file)
-            key_metrics = calculate_key_metrics(df)
-            seasonal_averages = calculate_seasonal_averages(df)
-            return create_dashboard_layout(df, metadata, timezone_str, key_metrics, seasonal_averages, sensor_id)
+            mtime = os.path.getmtime(csv_file)
+            data = load_sensor_data(sensor_id, csv_file, mtime)
+            figures = {
+                graph_id: orjson.loads(figure_json)
+                for graph_id, figure_json in load_figures_json(sensor_id, csv_file, mtime).items()
+            }
+            return create_dashboard_layout(data, figures, sensor_id)
     return html.Div([html.H2("404: Page not found")])
 
 @app.callback(
@@ -516,4 +811,21 @@ def update_carousel(selected_idx, children):
     return children
 
 if __name__ == "__main__":
-    app.run_server(debug=True)
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the sensor dashboard, or precompute its rollups.")
+    parser.add_argument("--precompute-rollups", action="store_true",
+                        help="Write Parquet rollups and a static HTML snapshot for every available sensor and exit "
+                             "(e.g. from a nightly cron job)")
+    args = parser.parse_args()
+
+    if args.precompute_rollups:
+        for sensor_id in get_available_sensors():
+            # One bad CSV must not stop the remaining sensors from being processed
+            try:
+                precompute_sensor_rollups(sensor_id)
+                render_static_snapshot(sensor_id)
+            except Exception:
+                logging.exception(f"Failed to precompute rollups for sensor {sensor_id}.")
+    else:
+        app.run_server(debug=True)
\ No newline at end of file
@@ -11,6 +11,8 @@ It performs the following key functions:
 Script Features:
 - Reads the client ID securely from a file to avoid hardcoding sensitive credentials.
 - Performs a case-insensitive search using a regular expression (regex) filter on water point names.
+  By default the regex is anchored to the start of the name, so the server can use a prefix index;
+  pass `--contains` to match the query anywhere in the name (slower, scans every water point).
 - Limits the results to 10 for debugging purposes to avoid overwhelming output.
 - Handles API errors gracefully and provides meaningful error messages for troubleshooting.
 - Allows flexible configuration of the client ID file path through command-line arguments.
@@ -18,7 +20,7 @@ Script Features:
 Usage:
 1. Save your mWater API `client_id` in a file (default: `client_id.txt`).
 2. Run the script using Python:
-   python search-mwater.py --client-id-file <path_to_client_id_file>
+   python search-mwater.py --client-id-file <path_to_client_id_file> [--contains]
    Replace `<path_to_client_id_file>` with the path to the file containing your `client_id`. 
    If not specified, the script defaults to using `client_id.txt`.
 
@@ -28,8 +30,8 @@ Example:
 Dependencies:
 - Python 3.x
 - Required libraries:
-  - `requests` (for making HTTP requests to the mWater API)
-  - `json` (for handling JSON data)
+  - `requests` (for making HTTP requests to the mWater API, over a pooled session with retries)
+  - `json` and `orjson` (for handling JSON data)
   - `argparse` (for parsing command-line arguments)
 
 Error Handling:
@@ -45,15 +47,31 @@ Notes:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import re
+import orjson
 import argparse
+import functools
 
-# Function to read client_id from a file
+# Create an HTTP session that keeps connections to the API open and retries
+# transient failures, so repeated searches don't pay a new TLS handshake each time
+def create_session():
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3)
+    session.mount('https://', HTTPAdapter(pool_maxsize=32, max_retries=retries))
+    return session
+
+session = create_session()
+
+# Function to read client_id from a file (cached, so batch callers read the file only once;
+# the token itself is never printed)
+@functools.lru_cache(maxsize=4)
 def read_client_id(file_path):
     try:
         with open(file_path, 'r') as file:
             client_id = file.read().strip()
-            print(f"Client ID read from file: {client_id}")
             return client_id
     except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -62,8 +80,9 @@ def read_client_id(file_path):
         print(f"An error occurred while reading the file: {e}")
         return None
 
-# Function to search for water points by name (e.g., "Kibimba") using the client_id
-def search_sites(client_id, query_name):
+# Function to search for water points by name (e.g., "Kibimba") using the client_id.
+# Names are matched by prefix unless contains=True; the query is matched literally.
+def search_sites(client_id, query_name, contains=False):
     url = 'https://api.mwater.co/v3/entities/water_point'  # Update the entity type as needed
 
     headers = {
@@ -71,22 +90,26 @@ def search_sites(client_id, query_name):
         'Content-Type': 'application/json'
     }
 
-    # Add a filter to search for water points whose name contains "Kibimba"
+    # Add a filter to search for water points whose name starts with (or contains) "Kibimba".
+    # An anchored pattern lets the server use an index on name instead of scanning every document.
+    pattern = re.escape(query_name)
+    if not contains:
+        pattern = f'^{pattern}'
     params = {
         'limit': 10,  # Limit the results for debugging
-        'filter': json.dumps({
+        'filter': orjson.dumps({
             'name': {
-                '$regex': query_name,
+                '$regex': pattern,
                 '$options': 'i'  # Case-insensitive search
             }
-        })
+        }).decode()
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = session.get(url, headers=headers, params=params)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data:
                 print(f"Found {len(data)} water points matching '{query_name}' (limited to 10).")
                 for site in data:
@@ -111,6 +134,8 @@ def main():
     parser = argparse.ArgumentParser(description="Search mWater sites by name")
     parser.add_argument('--client-id-file', type=str, default='client_id.txt',
                         help="Path to the file containing the client_id (default: 'client_id.txt')")
+    parser.add_argument('--contains', action='store_true',
+                        help="Match the name anywhere rather than only at the start (slower)")
     args = parser.parse_args()
 
     # Step 1: Read the client_id from the file (either provided via command line or default file)
@@ -118,7 +143,7 @@ def main():
 
     if client_id:
         # Step 2: Use the client_id to search for water points matching "Kibimba"
-        search_sites(client_id, "Kibimba")
+        search_sites(client_id, "Kibimba", contains=args.contains)
 
 # Run the main function
 if __name__ == "__main__":